@@ -1,7 +1,17 @@
+import os
+import json
+import socket
+import queue
+import http.client
+from urllib.parse import urlparse
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import MinMaxScaler
 
+# Set RECOMMENDER_SERVER_URL (e.g. http://127.0.0.1:8765 or unix:///tmp/recommender.sock)
+# to use a running modules.recommender_server instead of building the matrices in-process.
+RECOMMENDER_SERVER_URL = os.environ.get("RECOMMENDER_SERVER_URL")
+
 # Load data
 ratings = pd.read_csv("Cleaned Datasets/movielens.csv")
 avg_ratings = ratings.groupby('movie_id')['rating'].mean().reset_index()
@@ -10,38 +20,132 @@ avg_ratings.rename(columns={'rating': 'avg_rating'}, inplace=True)
 movies = pd.read_csv("Cleaned Datasets/cleaned_movies.csv")
 movies = movies.merge(avg_ratings, on='movie_id', how='left')
 
-data = pd.read_csv("Cleaned Datasets/movielens.csv")
-
-# --- Collaborative Filtering (CF) Similarity ---
-user_item_matrix = data.pivot_table(index='user_id', columns='movie_id', values='rating')
-user_item_matrix.fillna(0, inplace=True)
-item_similarity = cosine_similarity(user_item_matrix.T)
-item_similarity_df = pd.DataFrame(item_similarity, index=user_item_matrix.columns, columns=user_item_matrix.columns)
-
-# --- Content-Based Filtering (CB) Similarity ---
-genre_cols = [col for col in movies.columns if col.startswith('genre_')]
-genre_similarity = cosine_similarity(movies[genre_cols])
-genre_similarity_df = pd.DataFrame(genre_similarity, index=movies['movie_id'], columns=movies['movie_id'])
 
-# --- Normalize both matrices ---
-scaler = MinMaxScaler()
-collab_norm = scaler.fit_transform(item_similarity_df)
-genre_norm = scaler.fit_transform(genre_similarity_df)
-collab_norm_df = pd.DataFrame(collab_norm, index=item_similarity_df.index, columns=item_similarity_df.columns)
-genre_norm_df = pd.DataFrame(genre_norm, index=genre_similarity_df.index, columns=genre_similarity_df.columns)
+# --- Hybrid Similarity Builder ---
+def build_hybrid_similarity(movies, data):
+    # --- Collaborative Filtering (CF) Similarity ---
+    user_item_matrix = data.pivot_table(index='user_id', columns='movie_id', values='rating')
+    user_item_matrix.fillna(0, inplace=True)
+    item_similarity = cosine_similarity(user_item_matrix.T)
+    item_similarity_df = pd.DataFrame(item_similarity, index=user_item_matrix.columns, columns=user_item_matrix.columns)
 
-# --- Hybrid Similarity ---
-hybrid_similarity_df = (0.6 * collab_norm_df) + (0.4 * genre_norm_df)
+    # --- Content-Based Filtering (CB) Similarity ---
+    genre_cols = [col for col in movies.columns if col.startswith('genre_')]
+    genre_similarity = cosine_similarity(movies[genre_cols])
+    genre_similarity_df = pd.DataFrame(genre_similarity, index=movies['movie_id'], columns=movies['movie_id'])
+
+    # --- Normalize both matrices ---
+    scaler = MinMaxScaler()
+    collab_norm = scaler.fit_transform(item_similarity_df)
+    genre_norm = scaler.fit_transform(genre_similarity_df)
+    collab_norm_df = pd.DataFrame(collab_norm, index=item_similarity_df.index, columns=item_similarity_df.columns)
+    genre_norm_df = pd.DataFrame(genre_norm, index=genre_similarity_df.index, columns=genre_similarity_df.columns)
+
+    # --- Hybrid Similarity ---
+    return (0.6 * collab_norm_df) + (0.4 * genre_norm_df)
+
+
+# --- Recommendation Server Client ---
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class RecommenderClient:
+    """Talks to modules.recommender_server over a shared pool of persistent connections."""
+
+    # Errors that mean a kept-alive connection was closed by the server while idle
+    STALE_CONNECTION_ERRORS = (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, url, timeout=30, pool_size=4):
+        self.url = urlparse(url)
+        self.timeout = timeout
+        # Pooled on the instance, not per thread: Streamlit runs every rerun on a new thread
+        # Keep (Streamlit processes * pool_size) at or below the server's --workers
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        if self.url.scheme == "unix":
+            return _UnixHTTPConnection(self.url.path, timeout=self.timeout)
+        return http.client.HTTPConnection(self.url.hostname, self.url.port or 80, timeout=self.timeout)
+
+    def _borrow(self):
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, path, payload):
+        body = json.dumps(payload)
+        headers = {"Content-Type": "application/json"}
+        while True:
+            conn, reused = self._borrow()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                result = json.loads(response.read())
+            except Exception as e:
+                conn.close()
+                # Retry on a fresh connection only if a pooled one had gone stale
+                if reused and isinstance(e, self.STALE_CONNECTION_ERRORS):
+                    continue
+                raise
+            self._release(conn)
+            if response.status != 200:
+                raise RuntimeError(result.get("error", f"Recommender server returned {response.status}"))
+            return result["result"]
+
+    def hybrid_recommend(self, movie_id, n_recommendations=5):
+        return self._post("/recommend", {"movie_id": int(movie_id), "n": n_recommendations})
+
+    def hybrid_recommend_batch(self, movie_ids, n_recommendations=5):
+        return self._post("/recommend/batch", {"movie_ids": [int(m) for m in movie_ids], "n": n_recommendations})
+
+    def recommend_by_genre_mood(self, genre, mood=None, n=5):
+        return self._post("/genre_mood", {"genre": genre, "mood": mood, "n": n})
+
+
+if RECOMMENDER_SERVER_URL:
+    client = RecommenderClient(RECOMMENDER_SERVER_URL)
+    hybrid_similarity_df = None
+else:
+    client = None
+    hybrid_similarity_df = build_hybrid_similarity(movies, ratings)
 
 # --- Hybrid Recommendation Function ---
 def hybrid_recommend(movie_id, hybrid_df, n_recommendations=5):
+    if hybrid_df is None and client is not None:
+        return client.hybrid_recommend(movie_id, n_recommendations)
     similar_scores = hybrid_df[movie_id].sort_values(ascending=False)
     similar_scores = similar_scores.drop(movie_id)
     top_movie_ids = similar_scores.head(n_recommendations).index.tolist()
     return top_movie_ids
 
+# --- Batched Hybrid Recommendation Function ---
+def hybrid_recommend_batch(movie_ids, hybrid_df, n_recommendations=5):
+    if hybrid_df is None and client is not None:
+        return client.hybrid_recommend_batch(movie_ids, n_recommendations)
+    return [hybrid_recommend(movie_id, hybrid_df, n_recommendations) for movie_id in movie_ids]
+
 # --- Genre + Mood Recommendation Function ---
 def recommend_by_genre_mood(genre, mood=None, n=5):
+    if client is not None:
+        return client.recommend_by_genre_mood(genre, mood, n)
+    return _recommend_by_genre_mood(genre, mood, n)
+
+def _recommend_by_genre_mood(genre, mood=None, n=5):
     genre = genre.lower().strip()
 
     # Filter movies based on the provided genre
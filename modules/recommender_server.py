@@ -0,0 +1,239 @@
+# modules/recommender_server.py
+#
+# Standalone recommendation server. Loads the hybrid similarity matrix once and
+# serves it to every Streamlit worker over HTTP, so workers don't each build it.
+#
+#   python -m modules.recommender_server --port 8765
+#   python -m modules.recommender_server --socket /tmp/recommender.sock
+#
+# Then start the workers with RECOMMENDER_SERVER_URL=http://127.0.0.1:8765
+# (or unix:///tmp/recommender.sock).
+#
+# --workers bounds the requests served at once; idle kept-alive connections
+# wait in a selector and don't hold a worker. Each Streamlit process pools up
+# to RecommenderClient's pool_size (4) connections, so keep
+# processes * pool_size at or below --workers (32 by default) to let every
+# pooled connection be served without queueing.
+
+import os
+import json
+import stat
+import queue
+import socket
+import argparse
+import selectors
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from modules import recommender
+from modules.recommender import build_hybrid_similarity, hybrid_recommend, hybrid_recommend_batch, movies, ratings
+
+# The server always computes locally, even if RECOMMENDER_SERVER_URL leaked into its environment
+hybrid_similarity_df = recommender.hybrid_similarity_df
+if hybrid_similarity_df is None:
+    hybrid_similarity_df = build_hybrid_similarity(movies, ratings)
+
+
+def _to_ids(movie_ids):
+    return [int(movie_id) for movie_id in movie_ids]
+
+
+# ===== Routes =====
+def handle_recommend(payload):
+    return _to_ids(hybrid_recommend(payload["movie_id"], hybrid_similarity_df, payload.get("n", 5)))
+
+def handle_recommend_batch(payload):
+    batch = hybrid_recommend_batch(payload["movie_ids"], hybrid_similarity_df, payload.get("n", 5))
+    return [_to_ids(movie_ids) for movie_ids in batch]
+
+def handle_genre_mood(payload):
+    return recommender._recommend_by_genre_mood(payload["genre"], payload.get("mood"), payload.get("n", 5))
+
+ROUTES = {
+    "/recommend": handle_recommend,
+    "/recommend/batch": handle_recommend_batch,
+    "/genre_mood": handle_genre_mood,
+}
+
+
+class RecommenderHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps client connections open between requests
+    protocol_version = "HTTP/1.1"
+    # Drop a client that stalls mid-request instead of letting it hold a pool worker
+    timeout = 10
+
+    def do_POST(self):
+        # Always consume the body, otherwise it is parsed as the next request on this connection
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self.close_connection = True
+            return self._send(400, {"error": "Invalid Content-Length header"})
+        body = self.rfile.read(length)
+
+        route = ROUTES.get(self.path)
+        if route is None:
+            return self._send(404, {"error": f"Unknown endpoint '{self.path}'"})
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return self._send(400, {"error": "Request body is not valid JSON"})
+        try:
+            result = route(payload)
+        except KeyError as e:
+            return self._send(400, {"error": f"Unknown or missing value: {e}"})
+        except Exception as e:
+            return self._send(500, {"error": str(e)})
+        self._send(200, {"result": result})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        if self.server.closing:
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_request(self, code="-", size="-"):
+        # Keep per-request access logs quiet; log_error still writes to stderr
+        pass
+
+
+class PooledMixIn:
+    """Serve requests on a bounded ThreadPoolExecutor.
+
+    Idle kept-alive connections wait in a selector instead of on a worker, and
+    are handed to the pool one request at a time once they have data to read.
+    max_workers therefore bounds requests in flight, not open connections.
+    """
+
+    def __init__(self, *args, max_workers=32, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closing = False
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="recommender")
+        self._pending = queue.SimpleQueue()
+        self._idle = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._idle.register(self._wakeup_r, selectors.EVENT_READ)
+        self._dispatcher = threading.Thread(target=self._dispatch_idle, name="recommender-dispatch", daemon=True)
+        self._dispatcher.start()
+
+    def process_request(self, request, client_address):
+        # Set up the handler without entering its blocking keep-alive loop
+        handler = self.RequestHandlerClass.__new__(self.RequestHandlerClass)
+        handler.request, handler.client_address, handler.server = request, client_address, self
+        handler.setup()
+        self._park(handler)
+
+    def _park(self, handler):
+        self._pending.put(handler)
+        self._wakeup_w.send(b"\0")
+
+    def _dispatch_idle(self):
+        while not self.closing:
+            for key, _ in self._idle.select():
+                if key.fileobj is self._wakeup_r:
+                    self._wakeup_r.recv(4096)
+                    while not self._pending.empty():
+                        handler = self._pending.get_nowait()
+                        self._idle.register(handler.request, selectors.EVENT_READ, handler)
+                else:
+                    self._idle.unregister(key.fileobj)
+                    self.executor.submit(self._serve_one, key.data)
+        for key in list(self._idle.get_map().values()):
+            if key.data is not None:
+                self._idle.unregister(key.fileobj)
+                self._close(key.data)
+
+    def _serve_one(self, handler):
+        try:
+            handler.close_connection = True
+            handler.handle_one_request()
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+            handler.close_connection = True
+        if handler.close_connection or self.closing:
+            self._close(handler)
+        else:
+            self._park(handler)
+
+    def _close(self, handler):
+        handler.finish()
+        self.shutdown_request(handler.request)
+
+    def server_close(self):
+        # Stop accepting, close idle connections, and let in-flight requests
+        # finish; their connections are closed instead of being kept alive
+        self.closing = True
+        self._wakeup_w.send(b"\0")
+        self._dispatcher.join()
+        self.executor.shutdown(wait=True)
+        while not self._pending.empty():
+            self._close(self._pending.get_nowait())
+        self._idle.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        super().server_close()
+
+
+class PooledHTTPServer(PooledMixIn, HTTPServer):
+    pass
+
+
+class PooledUnixHTTPServer(PooledMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+def _socket_in_use(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve movie recommendations to Streamlit workers.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=32, help="Maximum number of requests served at once")
+    args = parser.parse_args()
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            if not stat.S_ISSOCK(os.stat(args.socket).st_mode):
+                parser.error(f"{args.socket} exists and is not a socket")
+            if _socket_in_use(args.socket):
+                parser.error(f"Another server is already listening on {args.socket}")
+            os.remove(args.socket)
+        server = PooledUnixHTTPServer(args.socket, RecommenderHandler, max_workers=args.workers)
+        print(f"Recommender server listening on unix://{args.socket}")
+    else:
+        server = PooledHTTPServer((args.host, args.port), RecommenderHandler, max_workers=args.workers)
+        print(f"Recommender server listening on http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
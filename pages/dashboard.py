@@ -52,89 +52,130 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# ===== Cached Data =====
+def clean_title(title):
+    return re.sub(r'\s*\(\d{4}\)', '', title).strip()
+
+# TMDB failures come back as None / "Cast not available", so let them expire
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_card_data(title):
+    clean_movie_title = clean_title(title)
+    poster_url = get_poster(clean_movie_title)
+    tmdb_id = get_tmdb_id(clean_movie_title)
+    movie_cast = get_movie_cast(tmdb_id)
+    return poster_url, movie_cast
+
+@st.cache_data(show_spinner=False)
+def get_recommendations(movie_id, n_recommendations=6):
+    return hybrid_recommend(movie_id, hybrid_similarity_df, n_recommendations=n_recommendations)
+
+def render_movie_cards(movie_ids):
+    cols = st.columns(3)
+    for idx, movie_id in enumerate(movie_ids):
+        movie = movies[movies['movie_id'] == movie_id].iloc[0]
+
+        # Loading spinner while fetching API data
+        with st.spinner(f"Loading poster and cast for {clean_title(movie['title'])}..."):
+            poster_url, movie_cast = get_card_data(movie['title'])
+        genres = get_movie_genres(movie)
+        with cols[idx % 3]:
+            st.markdown(f"""
+                <div class="card">
+                <h4>{movie['title']}</h4>
+                <img src="{poster_url}" width="100%" height="400">
+                <p><strong>Genres:</strong> {genres if genres else 'N/A'}</p>
+                <p><strong>Rating:</strong> {'⭐ ' + str(movie['avg_rating']) if pd.notnull(movie['avg_rating']) else 'N/A'}</p>
+                <p><strong>Cast:</strong> {movie_cast}</p>
+                </div>
+            """, unsafe_allow_html=True)
+
+# ===== Home Tab =====
+def home_shelf():
+    st.subheader("Recommended for you")
+    # Pin the sample so reruns elsewhere on the page don't reshuffle it
+    if 'home_movie_ids' not in st.session_state:
+        st.session_state.home_movie_ids = movies['movie_id'].sample(6).tolist()
+    render_movie_cards(st.session_state.home_movie_ids)
+
+# ===== Search Movie Tab =====
+@st.fragment
+def search_results():
+    st.subheader("Search or Browse for a Movie to get Recommendations")
+    search_query = st.text_input("Search for a movie (or leave blank to browse all)")
+    if search_query:
+        filtered_movies = movies[movies['title'].str.contains(search_query, case=False, na=False)]
+    else:
+        filtered_movies = movies
+    selected_movie = st.selectbox("Select a movie", filtered_movies['title'].values if not filtered_movies.empty else ["No movies found"])
+
+    if selected_movie and selected_movie != "No movies found":
+        st.success(f"You selected: {selected_movie}")
+        movie_id = int(filtered_movies[filtered_movies['title'] == selected_movie]['movie_id'].values[0])
+        recommended_ids = get_recommendations(movie_id, n_recommendations=6)
+        st.markdown(f"### 🎯 Recommendations based on **{selected_movie}**")
+        render_movie_cards(recommended_ids)
+    else:
+        st.warning("No movies found! Try another title.")
+
+# ===== Sentiment Tab =====
+@st.fragment
+def sentiment_analysis():
+    st.subheader("Sentiment Analysis for Reviews")
+    review = st.text_area("Enter a movie review")
+    if st.button("Analyze Sentiment"):
+        if review:
+            sentiment, confidence = predict_sentiment(review)
+            st.info(f"Sentiment: **{sentiment}** (Confidence: {confidence:.2f})")
+        else:
+            st.warning("Please enter a review first.")
+
+# ===== Chatbot =====
+@st.fragment
+def chatbot():
+    if 'chat_history' not in st.session_state:
+        st.session_state.chat_history = []
+
+    # User input FIRST
+    user_query = st.chat_input("Ask me about movies...")
+
+    if user_query and user_query.strip():
+        # Add user message immediately
+        st.session_state.chat_history.append({"role": "user", "content": user_query})
+    
+        with st.spinner("🎯 Chatbot is finding the best picks..."):
+            # Get agent response on same cycle
+            memory_variables = memory.load_memory_variables({})
+            response = agent_chain.invoke({
+                "input": user_query,
+                "chat_history": memory.chat_memory.messages,
+                "last_movie": memory_variables.get("last_movie", ""),
+                "last_genre": memory_variables.get("last_genre", ""),
+                "last_recommend_count": memory_variables.get("last_recommend_count", "")
+            })
+            bot_reply = response.get('output', "Hmm... I'm not sure how to respond to that.")
+            st.session_state.chat_history.append({"role": "assistant", "content": bot_reply})
+
+    # Render chat history AFTER processing both user & bot
+    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
+    for msg in st.session_state.chat_history:
+        role_class = "user-bubble" if msg['role'] == "user" else "bot-bubble"
+        st.markdown(f'<div class="{role_class}">{msg["content"]}</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
 # ===== Split Layout =====
 main_col, chat_col = st.columns([4, 1])
 
 with main_col:
     tabs = st.tabs(["🏠 Home", "🔍 Search Movie", "📝 Sentiment Analysis"])
 
-    def clean_title(title):
-        return re.sub(r'\s*\(\d{4}\)', '', title).strip()
-
-    # ===== Home Tab =====
     with tabs[0]:
-        st.subheader("Recommended for you")
-        default_movie_ids = movies['movie_id'].sample(6).tolist()
-        cols = st.columns(3)
-        for idx, movie_id in enumerate(default_movie_ids):
-            movie = movies[movies['movie_id'] == movie_id].iloc[0]
-            clean_movie_title = clean_title(movie['title'])
-
-            # Loading spinner while fetching API data
-            with st.spinner(f"Loading poster and cast for {clean_movie_title}..."):
-                poster_url = get_poster(clean_movie_title)
-                tmdb_id = get_tmdb_id(clean_movie_title)
-                movie_cast = get_movie_cast(tmdb_id)
-            genres = get_movie_genres(movie)    
-            with cols[idx % 3]:
-                st.markdown(f"""
-                    <div class="card">
-                    <h4>{movie['title']}</h4>
-                    <img src="{poster_url}" width="100%" height="400">
-                    <p><strong>Genres:</strong> {genres if genres else 'N/A'}</p>
-                    <p><strong>Rating:</strong> {'⭐ ' + str(movie['avg_rating']) if pd.notnull(movie['avg_rating']) else 'N/A'}</p>
-                    <p><strong>Cast:</strong> {movie_cast}</p>
-                    </div>
-                """, unsafe_allow_html=True)
-
-    # ===== Search Movie Tab =====
+        home_shelf()
+
     with tabs[1]:
-        st.subheader("Search or Browse for a Movie to get Recommendations")
-        search_query = st.text_input("Search for a movie (or leave blank to browse all)")
-        if search_query:
-            filtered_movies = movies[movies['title'].str.contains(search_query, case=False, na=False)]
-        else:
-            filtered_movies = movies
-        selected_movie = st.selectbox("Select a movie", filtered_movies['title'].values if not filtered_movies.empty else ["No movies found"])
-
-        if selected_movie and selected_movie != "No movies found":
-            st.success(f"You selected: {selected_movie}")
-            if selected_movie:
-                movie_id = filtered_movies[filtered_movies['title'] == selected_movie]['movie_id'].values[0]
-                recommended_ids = hybrid_recommend(movie_id, hybrid_similarity_df, n_recommendations=6)
-                st.markdown(f"### 🎯 Recommendations based on **{selected_movie}**")
-                cols = st.columns(3)
-                for idx, rec_id in enumerate(recommended_ids):
-                    movie = movies[movies['movie_id'] == rec_id].iloc[0]
-                    clean_movie_title = clean_title(movie['title'])
-                    with st.spinner(f"Loading poster and cast for {clean_movie_title}..."):
-                        poster_url = get_poster(clean_movie_title)
-                        tmdb_id = get_tmdb_id(clean_movie_title)
-                        movie_cast = get_movie_cast(tmdb_id)
-                    genres = get_movie_genres(movie)
-                    with cols[idx % 3]:
-                        st.markdown(f"""
-                            <div class="card">
-                            <h4>{movie['title']}</h4>
-                            <img src="{poster_url}" width="100%" height="400">
-                            <p><strong>Genres:</strong> {genres if genres else 'N/A'}</p>
-                            <p><strong>Rating:</strong> {'⭐ ' + str(movie['avg_rating']) if pd.notnull(movie['avg_rating']) else 'N/A'}</p>
-                            <p><strong>Cast:</strong> {movie_cast}</p>
-                            </div>
-                        """, unsafe_allow_html=True)
-        else:
-            st.warning("No movies found! Try another title.")
+        search_results()
 
-    # ===== Sentiment Tab =====
     with tabs[2]:
-        st.subheader("Sentiment Analysis for Reviews")
-        review = st.text_area("Enter a movie review")
-        if st.button("Analyze Sentiment"):
-            if review:
-                sentiment, confidence = predict_sentiment(review)
-                st.info(f"Sentiment: **{sentiment}** (Confidence: {confidence:.2f})")
-            else:
-                st.warning("Please enter a review first.")
+        sentiment_analysis()
 
     # ===== Footer =====
     st.markdown("""---<center>Made with ❤️ | Movie Recommender</center>""", unsafe_allow_html=True)
@@ -191,32 +232,4 @@ with chat_col:
     st.markdown("<h3 style='color: #e50914; text-align: center; margin-bottom: 0;'>🎬 Movies Bot</h3>", unsafe_allow_html=True)
     st.caption("Your personal movie recommender 🎥")
 
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
-
-    # User input FIRST
-    user_query = st.chat_input("Ask me about movies...")
-
-    if user_query and user_query.strip():
-        # Add user message immediately
-        st.session_state.chat_history.append({"role": "user", "content": user_query})
-        
-        with st.spinner("🎯 Chatbot is finding the best picks..."):
-            # Get agent response on same cycle
-            memory_variables = memory.load_memory_variables({})
-            response = agent_chain.invoke({
-                "input": user_query,
-                "chat_history": memory.chat_memory.messages,
-                "last_movie": memory_variables.get("last_movie", ""),
-                "last_genre": memory_variables.get("last_genre", ""),
-                "last_recommend_count": memory_variables.get("last_recommend_count", "")
-            })
-            bot_reply = response.get('output', "Hmm... I'm not sure how to respond to that.")
-            st.session_state.chat_history.append({"role": "assistant", "content": bot_reply})
-
-    # Render chat history AFTER processing both user & bot
-    st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-    for msg in st.session_state.chat_history:
-        role_class = "user-bubble" if msg['role'] == "user" else "bot-bubble"
-        st.markdown(f'<div class="{role_class}">{msg["content"]}</div>', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    chatbot()
@@ -0,0 +1,183 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import importlib
+import threading
+import http.client
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Small synthetic catalog and ratings, standing in for "Cleaned Datasets"
+MOVIES = pd.DataFrame({
+    "movie_id": [1, 2, 3, 4, 5, 6],
+    "title": ["Alpha (1995)", "Bravo (1996)", "Charlie (1997)", "Delta (1998)", "Echo (1999)", "Foxtrot (2000)"],
+    "genre_1": [1, 1, 0, 0, 1, 0],
+    "genre_5": [0, 1, 1, 0, 0, 1],
+    "genre_8": [0, 0, 1, 1, 1, 0],
+})
+RATINGS = pd.DataFrame({
+    "user_id": [1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4],
+    "movie_id": [1, 2, 3, 2, 3, 4, 4, 5, 6, 1, 5, 6],
+    "rating": [5, 4, 2, 3, 5, 4, 2, 4, 5, 4, 3, 1],
+})
+
+
+@pytest.fixture(scope="module")
+def recommender_modules():
+    def read_csv(path, *args, **kwargs):
+        return (RATINGS if "movielens" in str(path) else MOVIES).copy()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.syspath_prepend(str(ROOT))
+        mp.delenv("RECOMMENDER_SERVER_URL", raising=False)
+        mp.setattr(pd, "read_csv", read_csv)
+        for name in ("modules.recommender", "modules.recommender_server"):
+            mp.delitem(sys.modules, name, raising=False)
+        yield importlib.import_module("modules.recommender"), importlib.import_module("modules.recommender_server")
+        for name in ("modules.recommender", "modules.recommender_server"):
+            sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def recommender(recommender_modules):
+    return recommender_modules[0]
+
+
+@pytest.fixture
+def serve(recommender_modules):
+    """Start servers on a temporary Unix socket; each counts the connections it accepts."""
+    recommender_server = recommender_modules[1]
+
+    class CountingServer(recommender_server.PooledUnixHTTPServer):
+        def process_request(self, request, client_address):
+            self.accepted += 1
+            super().process_request(request, client_address)
+
+    # Short directory: Unix socket paths are limited to ~100 characters
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, "recommender.sock")
+    running = []
+
+    def start(max_workers=4):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = CountingServer(socket_path, recommender_server.RecommenderHandler, max_workers=max_workers)
+        server.accepted = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        running.append(server)
+        return server, f"unix://{socket_path}"
+
+    def stop(server):
+        running.remove(server)
+        server.shutdown()
+        server.server_close()
+
+    start.stop = stop
+    yield start
+    for server in list(running):
+        stop(server)
+    shutil.rmtree(socket_dir)
+
+
+def test_results_match_in_process(recommender, serve):
+    _, url = serve()
+    client = recommender.RecommenderClient(url)
+    df = recommender.hybrid_similarity_df
+
+    assert client.hybrid_recommend(1, 3) == recommender.hybrid_recommend(1, df, n_recommendations=3)
+    assert client.hybrid_recommend_batch([1, 2, 3], 2) == recommender.hybrid_recommend_batch([1, 2, 3], df, n_recommendations=2)
+    assert client.recommend_by_genre_mood("Comedy", "happy", 2) == recommender.recommend_by_genre_mood("Comedy", "happy", 2)
+    assert client.recommend_by_genre_mood("Nonexistent") == recommender.recommend_by_genre_mood("Nonexistent")
+
+
+def test_connection_is_reused_across_threads(recommender, serve):
+    server, url = serve()
+    client = recommender.RecommenderClient(url)
+    client.hybrid_recommend(1)
+
+    # A new thread, like a Streamlit rerun, uses the same pooled connection
+    thread = threading.Thread(target=client.hybrid_recommend, args=(2,))
+    thread.start()
+    thread.join()
+    client.hybrid_recommend(3)
+    assert server.accepted == 1
+
+
+def test_error_replies_keep_connection_usable(recommender, serve):
+    server, url = serve()
+    client = recommender.RecommenderClient(url)
+
+    with pytest.raises(RuntimeError, match="Unknown endpoint"):
+        client._post("/nope", {"movie_id": 1})
+    with pytest.raises(RuntimeError):
+        client.hybrid_recommend(-1)
+    assert client.hybrid_recommend(1, 2) == recommender.hybrid_recommend(1, recommender.hybrid_similarity_df, 2)
+    assert server.accepted == 1
+
+
+def test_stale_connection_is_retried(recommender, serve):
+    old_server, url = serve()
+    client = recommender.RecommenderClient(url)
+    client.hybrid_recommend(1)
+
+    # Restarting the server closes the connection the client has pooled
+    serve.stop(old_server)
+    new_server, _ = serve()
+    assert client.hybrid_recommend(1, 2) == recommender.hybrid_recommend(1, recommender.hybrid_similarity_df, 2)
+    assert new_server.accepted == 1
+
+
+def test_idle_connections_do_not_hold_workers(recommender, serve):
+    server, url = serve(max_workers=2)
+    warm_clients = [recommender.RecommenderClient(url) for _ in range(3)]
+    for client in warm_clients:
+        client.hybrid_recommend(1)
+
+    started = time.monotonic()
+    recommender.RecommenderClient(url).hybrid_recommend(1)
+    assert time.monotonic() - started < 2
+    for client in warm_clients:
+        client.hybrid_recommend(2)
+    assert server.accepted == 4
+
+
+def test_server_close_drops_kept_alive_connections(recommender, serve):
+    server, url = serve()
+    client = recommender.RecommenderClient(url)
+    client.hybrid_recommend(1)
+
+    started = time.monotonic()
+    serve.stop(server)
+    assert time.monotonic() - started < 2
+    assert not [t for t in threading.enumerate() if t.name.startswith("recommender")]
+    with pytest.raises(OSError):
+        client.hybrid_recommend(1)
+
+
+def test_bad_requests_are_rejected_and_logged(recommender, serve, capfd):
+    _, url = serve()
+    conn = recommender.RecommenderClient(url)._connect()
+
+    conn.putrequest("POST", "/recommend")
+    conn.putheader("Content-Length", "abc")
+    conn.endheaders()
+    response = conn.getresponse()
+    response.read()
+    assert response.status == 400
+    assert response.getheader("Connection") == "close"
+    conn.close()
+
+    conn = recommender.RecommenderClient(url)._connect()
+    conn.connect()
+    conn.sock.sendall(b"BOGUS\r\n\r\n")
+    conn.sock.recv(4096)
+    conn.close()
+    assert "Bad request" in capfd.readouterr().err